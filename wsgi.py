@@ -0,0 +1,10 @@
+# wsgi.py
+# Production entrypoint for CEA – Circular Economy AI.
+#
+# The dev server started by `python app.py` is single-process and not
+# meant for real traffic. Run this module under a proper WSGI server
+# with multiple workers instead, e.g.:
+#
+#   gunicorn -w 4 -k gthread --threads 8 wsgi:application
+
+from app import app as application